@@ -1,6 +1,5 @@
 import os
-import shutil
-from huggingface_hub import HfApi
+from huggingface_hub import HfApi, CommitOperationAdd, CommitOperationDelete
 
 def deploy():
     print("🚀 Preparing API Deployment...")
@@ -9,47 +8,60 @@ def deploy():
     token = input("Paste Hugging Face WRITE Token: ").strip()
     repo_id = input("Paste API Space Repo ID (e.g. envererman08/stock-analysis-api): ").strip()
 
-    # 2. Copy Files to deploy folder
-    deploy_dir = "stock_api_deploy"
+    # 2. Collect files straight from their source folders (no staging copy)
+    deploy_dir = "stock_api_deploy"  # Space config: Dockerfile + requirements.txt
     source_dir = "stock"
     
-    files_to_copy = [
+    files_to_upload = [
         "api.py",
         "data_layer.py", 
         "analysis_layer.py",
-        "adaboost_model.joblib",
-        "scaler.joblib"
+        "models.py",
+        "_kernels.py",
+        "model_metadata.json"
     ]
     
-    print(f"\n📦 Copying files to {deploy_dir}...")
-    for f in files_to_copy:
-        try:
-            # Try stock/ folder first
-            src = os.path.join(source_dir, f)
-            if not os.path.exists(src):
-                # Try root folder
-                src = f
-            
-            shutil.copy2(src, os.path.join(deploy_dir, f))
-            print(f"✅ Copied {f}")
-        except Exception as e:
-            print(f"❌ Failed to copy {f}: {e}")
-            
-    # Copy metadata from root
-    try:
-        shutil.copy2("model_metadata.json", os.path.join(deploy_dir, "model_metadata.json"))
-        print("✅ Copied model_metadata.json")
-    except:
-        pass # Optional
+    print(f"\n📦 Collecting files from {source_dir}...")
+    operations = []
+    for f in files_to_upload:
+        # Try stock/ folder first
+        src = os.path.join(source_dir, f)
+        if not os.path.exists(src):
+            # Try root folder
+            src = f
+        if os.path.exists(src):
+            operations.append(CommitOperationAdd(path_in_repo=f, path_or_fileobj=src))
+            print(f"✅ Added {src}")
+        else:
+            print(f"❌ Missing {f}")
+    
+    # The optional artifacts (scaler for pre-HistGradientBoosting builds, ONNX export)
+    # must come from the same build as the model, so all are resolved from one folder
+    model_dir = source_dir if os.path.exists(os.path.join(source_dir, "adaboost_model.joblib")) else "."
+    optional_artifacts = ["scaler.joblib", "model.onnx"]
+    for f in ["adaboost_model.joblib"] + optional_artifacts:
+        src = os.path.join(model_dir, f)
+        if os.path.exists(src):
+            operations.append(CommitOperationAdd(path_in_repo=f, path_or_fileobj=src))
+            print(f"✅ Added {src}")
+    
+    for f in ["Dockerfile", "requirements.txt"]:
+        src = os.path.join(deploy_dir, f)
+        operations.append(CommitOperationAdd(path_in_repo=f, path_or_fileobj=src))
+        print(f"✅ Added {src}")
 
     # 3. Upload
     print(f"\n☁️ Uploading to {repo_id}...")
     try:
         api = HfApi(token=token)
-        api.upload_folder(
-            folder_path=deploy_dir,
+        # Optional artifacts left on the Space by an older build must not be paired with this model
+        for f in optional_artifacts:
+            if not os.path.exists(os.path.join(model_dir, f)) and api.file_exists(repo_id, f, repo_type="space"):
+                operations.append(CommitOperationDelete(path_in_repo=f))
+        api.create_commit(
             repo_id=repo_id,
             repo_type="space",
+            operations=operations,
             commit_message="Deploy FastAPI Backend"
         )
         print("\n🎉 API DEPLOYMENT SUCCESSFUL!")
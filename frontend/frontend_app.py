@@ -1,15 +1,36 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import plotly.graph_objects as go
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Configuration
 API_URL = os.getenv("API_URL", "http://localhost:8000")
 
+# (connect, read) timeouts; the undervalued scan fetches fundamentals for ~100 tickers
+TIMEOUT = (5, 60)
+SCAN_TIMEOUT = (5, 180)
+
 st.set_page_config(page_title="Stock Analysis AI", layout="wide")
 
+# Shared session so repeated calls reuse pooled keep-alive connections.
+# Cached as a resource so Streamlit reruns don't throw the pool away.
+@st.cache_resource
+def get_session():
+    session = requests.Session()
+    # read=0: a read timeout means the server is still working (e.g. the 180s scan);
+    # retrying would only block the script again and restart that work
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=Retry(total=3, read=0, backoff_factor=0.2))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+SESSION = get_session()
+
 st.title("📈 Stock Analysis AI System")
 st.markdown("Enter a stock symbol to analyze, or view undervalued stocks.")
 
@@ -18,7 +39,7 @@ page = st.sidebar.selectbox("Navigate", ["Analysis", "Undervalued Stocks"])
 
 def fetch_prediction(symbol):
     try:
-        resp = requests.get(f"{API_URL}/predict/{symbol}")
+        resp = SESSION.get(f"{API_URL}/predict/{symbol}", timeout=TIMEOUT)
         if resp.status_code == 200:
             return resp.json()
     except:
@@ -27,7 +48,7 @@ def fetch_prediction(symbol):
 
 def fetch_analysis(symbol):
     try:
-        resp = requests.get(f"{API_URL}/analyze/{symbol}")
+        resp = SESSION.get(f"{API_URL}/analyze/{symbol}", timeout=TIMEOUT)
         if resp.status_code == 200:
             return resp.json()
     except:
@@ -36,7 +57,7 @@ def fetch_analysis(symbol):
 
 def fetch_undervalued(limit=5):
     try:
-        resp = requests.get(f"{API_URL}/undervalued?limit={limit}")
+        resp = SESSION.get(f"{API_URL}/undervalued?limit={limit}", timeout=SCAN_TIMEOUT)
         if resp.status_code == 200:
             return resp.json()['undervalued_stocks']
     except:
@@ -45,7 +66,7 @@ def fetch_undervalued(limit=5):
 
 def fetch_sentiment(symbol):
     try:
-        resp = requests.get(f"{API_URL}/sentiment/{symbol}")
+        resp = SESSION.get(f"{API_URL}/sentiment/{symbol}", timeout=TIMEOUT)
         if resp.status_code == 200:
             return resp.json()
     except:
@@ -59,12 +80,14 @@ if page == "Analysis":
         symbol = st.text_input("Enter Stock Symbol (e.g., AAPL):", value="AAPL").upper()
         if st.button("Analyze"):
             with st.spinner(f"Analyzing {symbol}..."):
-                # Prediction
-                pred_data = fetch_prediction(symbol)
-                # Analysis
-                analysis_data = fetch_analysis(symbol)
-                # Sentiment
-                sentiment_data = fetch_sentiment(symbol)
+                # Prediction, Analysis and Sentiment are independent, so run them concurrently
+                with ThreadPoolExecutor(max_workers=3) as ex:
+                    f_pred = ex.submit(fetch_prediction, symbol)
+                    f_anl = ex.submit(fetch_analysis, symbol)
+                    f_sent = ex.submit(fetch_sentiment, symbol)
+                    pred_data = f_pred.result()
+                    analysis_data = f_anl.result()
+                    sentiment_data = f_sent.result()
                 
                 if pred_data and analysis_data:
                     st.success("Analysis Complete!")
@@ -101,7 +124,7 @@ if page == "Analysis":
             # Custom Model Display (Dedicated Section)
             custom = pred.get('custom_model', {})
             if custom:
-                st.info(f"🎓 **Custom AdaBoost Model says:** {custom.get('prediction', 'N/A')} (Conf: {custom.get('confidence', 0)*100:.1f}%)")
+                st.info(f"🎓 **Custom {custom.get('model_type') or 'Model'} says:** {custom.get('prediction', 'N/A')} (Conf: {custom.get('confidence', 0)*100:.1f}%)")
             else:
                 st.warning("Custom model data missing from API response.")
             
@@ -117,7 +140,7 @@ if page == "Analysis":
             # Sentiment Analysis
             if 'sentiment_data' in st.session_state and st.session_state['sentiment_data']:
                 sent = st.session_state['sentiment_data']
-                st.subheader("📰 AI News Sentiment Analysis (FinBERT)")
+                st.subheader("📰 AI News Sentiment Analysis")
                 
                 s_col1, s_col2 = st.columns([1, 2])
                 with s_col1:
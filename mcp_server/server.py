@@ -1,5 +1,8 @@
 from fastmcp import FastMCP
+import ijson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Create an MCP server
 mcp = FastMCP("Stock Analysis MCP")
@@ -7,6 +10,17 @@ mcp = FastMCP("Stock Analysis MCP")
 # Backend API URL
 API_URL = "http://localhost:8000"
 
+# Shared session so repeated calls reuse pooled keep-alive connections
+SESSION = requests.Session()
+# read=0: retry connection failures only; a timed-out read would restart a slow scan
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=Retry(total=3, read=0, backoff_factor=0.2))
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
+# (connect, read) timeouts; the undervalued scan fetches fundamentals for ~100 tickers
+TIMEOUT = (5, 60)
+SCAN_TIMEOUT = (5, 180)
+
 @mcp.tool()
 def get_stock_prediction(symbol: str) -> str:
     """
@@ -15,7 +29,7 @@ def get_stock_prediction(symbol: str) -> str:
         symbol: The stock ticker symbol (e.g., AAPL, MSFT).
     """
     try:
-        response = requests.get(f"{API_URL}/predict/{symbol}")
+        response = SESSION.get(f"{API_URL}/predict/{symbol}", timeout=TIMEOUT)
         if response.status_code == 200:
             data = response.json()
             return f"Prediction for {symbol}: {data['prediction']} (Current Price: {data['current_price']:.2f}, SMA20: {data['sma_20']:.2f})"
@@ -32,7 +46,7 @@ def get_financial_analysis(symbol: str) -> str:
         symbol: The stock ticker symbol.
     """
     try:
-        response = requests.get(f"{API_URL}/analyze/{symbol}")
+        response = SESSION.get(f"{API_URL}/analyze/{symbol}", timeout=TIMEOUT)
         if response.status_code == 200:
             data = response.json()
             r = data['ratios']
@@ -54,19 +68,19 @@ def find_undervalued_stocks(limit: int = 5) -> str:
        limit: Maximum number of stocks to return (default 5).
     """
     try:
-        response = requests.get(f"{API_URL}/undervalued?limit={limit}")
-        if response.status_code == 200:
-            data = response.json()
-            stocks = data['undervalued_stocks']
-            if not stocks:
+        # Stream-parse the list so large scans are never held as one JSON document
+        with SESSION.get(f"{API_URL}/undervalued?limit={limit}", timeout=SCAN_TIMEOUT, stream=True) as response:
+            if response.status_code != 200:
+                return "Error: Could not fetch undervalued stocks."
+            response.raw.decode_content = True
+            
+            lines = []
+            for s in ijson.items(response.raw, 'undervalued_stocks.item', use_float=True):
+                lines.append(f"- {s['symbol']} (Score: {s['score']}/4) | P/E: {s.get('pe_ratio', 'N/A')} | ROE: {s.get('roe', 'N/A')}%\n")
+            if not lines:
                 return "No undervalued stocks found matching the criteria."
             
-            result = "Undervalued Stocks Recommendations:\n"
-            for s in stocks:
-                result += f"- {s['symbol']} (Score: {s['score']}/4) | P/E: {s.get('pe_ratio', 'N/A')} | ROE: {s.get('roe', 'N/A')}%\n"
-            return result
-        else:
-            return "Error: Could not fetch undervalued stocks."
+            return "Undervalued Stocks Recommendations:\n" + "".join(lines)
     except Exception as e:
         return f"Error connecting to API: {str(e)}"
 
@@ -78,7 +92,7 @@ def get_stock_sentiment(symbol: str) -> str:
         symbol: The stock ticker symbol.
     """
     try:
-        response = requests.get(f"{API_URL}/sentiment/{symbol}")
+        response = SESSION.get(f"{API_URL}/sentiment/{symbol}", timeout=TIMEOUT)
         if response.status_code == 200:
             data = response.json()
             if "error" in data:
@@ -0,0 +1,82 @@
+import numpy as np
+from numba import njit, prange
+
+@njit(cache=True)
+def rolling_mean(x, window):
+    """
+    Trailing simple moving average over a 1-D float64 array.
+    Matches pandas' rolling(window).mean(): the first window-1 values are NaN, and so
+    is any window containing a NaN (min_periods=window) until that NaN leaves it.
+    """
+    out = np.full_like(x, np.nan)
+    s = 0.0
+    count = 0  # non-NaN values in the window; NaNs are kept out of the running sum
+    for i in range(len(x)):
+        if not np.isnan(x[i]):
+            s += x[i]
+            count += 1
+        if i >= window and not np.isnan(x[i - window]):
+            s -= x[i - window]
+            count -= 1
+        if count == window:
+            out[i] = s / window
+    return out
+
+# error_model='numpy': a window with no losses divides by zero and gives RSI 100
+# (as the pandas/NumPy versions do) instead of raising ZeroDivisionError.
+@njit(cache=True, error_model='numpy')
+def rsi_last(c, window=14):
+    """
+    Last value of Wilder's RSI over a 1-D float64 close array, in one pass.
+    Matches build_model.calculate_rsi: gains/losses are smoothed with
+    ewm(alpha=1/window, adjust=False), seeded with the first price change.
+    """
+    if len(c) < 2:
+        return np.nan
+    alpha = 1.0 / window
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, len(c)):
+        d = c[i] - c[i - 1]
+        # NaN changes count as no move, like np.where in calculate_rsi
+        gain = d if d > 0 else 0.0
+        loss = -d if d < 0 else 0.0
+        if i == 1:
+            avg_gain = gain
+            avg_loss = loss
+        else:
+            avg_gain += alpha * (gain - avg_gain)
+            avg_loss += alpha * (loss - avg_loss)
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+@njit(cache=True, error_model='numpy')
+def rsi_sma_last(c, window=14):
+    """
+    Last value of the rolling-mean RSI (simple averages of the last `window`
+    gains/losses), as build_model.calculate_rsi computed it before the Wilder
+    switch. Models trained before then expect this variant.
+    """
+    n = len(c)
+    if n < window:
+        return np.nan
+    gain = 0.0
+    loss = 0.0
+    # Change j is c[j] - c[j-1]; the first bar has none and counts as 0
+    for j in range(max(n - window, 1), n):
+        d = c[j] - c[j - 1]
+        if d > 0:
+            gain += d
+        elif d < 0:
+            loss -= d
+    # The 1/window of both averages cancels in the ratio
+    return 100.0 - 100.0 / (1.0 + gain / loss)
+
+@njit(cache=True, parallel=True)
+def rsi_batch(closes, window=14):
+    """
+    rsi_last for each row of a 2-D (n_tickers, n_days) close array, rows in parallel.
+    """
+    out = np.empty(closes.shape[0])
+    for i in prange(closes.shape[0]):
+        out[i] = rsi_last(closes[i], window)
+    return out
@@ -1,23 +1,93 @@
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+# Universe for find_undervalued_stocks: a small hardcoded list for demonstration
+# (S&P 100 tickers). Built once at import instead of on every scan.
+_CANDIDATES = (
+    'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'META', 'TSLA', 'BRK-B', 'V', 'UNH',
+    'JNJ', 'XOM', 'JPM', 'PG', 'MA', 'LLY', 'HD', 'CVX', 'MRK', 'ABBV',
+    'PEP', 'KO', 'AVGO', 'COST', 'TMO', 'MCD', 'CSCO', 'ACN', 'WMT', 'PFE',
+    'BAC', 'LIN', 'CRM', 'ABT', 'DIS', 'AMD', 'DHR', 'TXN', 'NEE', 'PM',
+    'WFC', 'ADBE', 'NKE', 'UPS', 'RTX', 'BMY', 'T', 'LOW', 'INTC', 'MS',
+    'QCOM', 'HON', 'IBM', 'UNP', 'INTU', 'SBUX', 'GE', 'EL', 'DE', 'GS',
+    'AMAT', 'C', 'CAT', 'PLD', 'BLK', 'BA', 'SCHW', 'CVS', 'AMT', 'MMC',
+    'COP', 'LMT', 'ADP', 'AXP', 'MDT', 'CI', 'GILD', 'ISRG', 'TJX', 'VRTX',
+    'TGT', 'MO', 'ZTS', 'EOG', 'BDX', 'SO', 'FI', 'SPGI', 'REGN', 'NOW',
+    'SYK', 'CB', 'BKNG', 'DUK', 'LRCX', 'ADI', 'Z', 'UBER', 'ABNB', 'PANW'
+)
+
+@dataclass(slots=True, frozen=True)
+class Ratios:
+    """
+    Financial ratios for a single symbol, with the keys expected by MCP.
+    Ratios that cannot be derived default to 0.0. Instances are immutable.
+    """
+    # Profitability
+    roe: float = 0.0
+    roa: float = 0.0
+    net_profit_margin: float = 0.0
+    gross_profit_margin: float = 0.0
+
+    # Liquidity
+    current_ratio: float = 0.0
+    quick_ratio: float = 0.0
+    cash_ratio: float = 0.0
+
+    # Leverage
+    debt_to_equity: float = 0.0
+    debt_to_assets: float = 0.0
+    equity_multiplier: float = 0.0
+
+    # Efficiency
+    asset_turnover: float = 0.0
+    inventory_turnover: float = 0.0
+    receivables_turnover: float = 0.0
+
+    # Valuation
+    pe_ratio: float = 0.0
+    pb_ratio: float = 0.0
+    market_cap: float = 0.0
+
+# Shared result for symbols whose data could not be fetched (safe since Ratios is frozen)
+_EMPTY_RATIOS = Ratios()
+
+# How long read-through caches keep fundamentals (they barely move intra-day)
+FUNDAMENTALS_TTL = 24 * 3600
+
+def cached_ratios(analyzer, cache, symbol: str):
+    """
+    analyzer.calculate_ratios(symbol), read through `cache` (a diskcache.Cache)
+    for FUNDAMENTALS_TTL seconds. Failed fetches are not stored.
+    """
+    key = ('ratios', symbol)
+    r = cache.get(key)
+    if r is None:
+        r = analyzer.calculate_ratios(symbol)
+        # Don't pin a failed fetch (all-zero ratios) for a whole day
+        if r != _EMPTY_RATIOS:
+            cache.set(key, r, expire=FUNDAMENTALS_TTL)
+    return r
 
 class FinancialAnalyzer:
     """
     Analyzes financial data and calculates ratios/trends.
     """
-    def __init__(self, data_manager):
+    def __init__(self, data_manager, max_workers: int = 32):
         self.data_manager = data_manager
+        # yfinance calls are network-bound, so threads overlap the HTTP latency
+        self.max_workers = max_workers
 
     def calculate_ratios(self, symbol: str):
         """
         Calculates financial ratios based on available data.
-        Returns an object (dot-accessible dict) with specific keys expected by MCP.
+        Returns a Ratios instance with the specific keys expected by MCP.
         """
-        data = self.data_manager.get_financials(symbol)
-        if not data or not data.get('info'):
+        # Only the info summary is needed here, not the full statements
+        info = self.data_manager.get_info(symbol)
+        if not info:
             return self._empty_ratios()
-
-        info = data['info']
         
         # Helper to safely get value
         def get_val(key, default=0.0):
@@ -25,11 +95,6 @@ class FinancialAnalyzer:
 
         # Mapping yfinance info keys to our expected structure
         # Note: yfinance keys change sometimes, this is a best-effort mapping for common keys
-        
-        class Ratios:
-            def __init__(self, **kwargs):
-                self.__dict__.update(kwargs)
-
         return Ratios(
             # Profitability
             roe=get_val('returnOnEquity', 0) * 100,
@@ -59,14 +124,7 @@ class FinancialAnalyzer:
         )
 
     def _empty_ratios(self):
-        class Ratios:
-             pass
-        r = Ratios()
-        for k in ['roe','roa','net_profit_margin','gross_profit_margin','current_ratio','quick_ratio','cash_ratio',
-                  'debt_to_equity','debt_to_assets','equity_multiplier','asset_turnover','inventory_turnover',
-                  'receivables_turnover','pe_ratio','pb_ratio','market_cap']:
-            setattr(r, k, 0.0)
-        return r
+        return _EMPTY_RATIOS
 
     def trend_analysis(self, symbol: str):
         """
@@ -84,55 +142,59 @@ class FinancialAnalyzer:
         """
         Compares multiple companies.
         """
-        results = []
-        for sym in symbols:
-            r = self.calculate_ratios(sym)
-            results.append({
-                'Symbol': sym,
-                'ROE': r.roe,
-                'PE': r.pe_ratio,
-                'PB': r.pb_ratio,
-                'Debt/Equity': r.debt_to_equity
-            })
-        return pd.DataFrame(results)
+        symbols = list(symbols)
+        rs = self._ratios_for(symbols)
+        # Column-oriented construction avoids pandas' row-to-column transpose
+        return pd.DataFrame({
+            'Symbol': symbols,
+            'ROE': [r.roe for r in rs],
+            'PE': [r.pe_ratio for r in rs],
+            'PB': [r.pb_ratio for r in rs],
+            'Debt/Equity': [r.debt_to_equity for r in rs]
+        })
+
+    def _ratios_for(self, symbols: list):
+        """
+        Calculates ratios for many symbols concurrently, preserving input order.
+        """
+        if not symbols:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(symbols))) as ex:
+            return list(ex.map(self.calculate_ratios, symbols))
 
     def find_undervalued_stocks(self, limit: int = 5):
         """
         Finds undervalued stocks from a predefined list.
         """
         # In a real app, this would scan a database.
-        # Here we scan a small hardcoded list for demonstration + S&P 500 examples.
-        # S&P 100 Tickers
-        candidates = [
-            'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'META', 'TSLA', 'BRK-B', 'V', 'UNH', 
-            'JNJ', 'XOM', 'JPM', 'PG', 'MA', 'LLY', 'HD', 'CVX', 'MRK', 'ABBV', 
-            'PEP', 'KO', 'AVGO', 'COST', 'TMO', 'MCD', 'CSCO', 'ACN', 'WMT', 'PFE', 
-            'BAC', 'LIN', 'CRM', 'ABT', 'DIS', 'AMD', 'DHR', 'TXN', 'NEE', 'PM', 
-            'WFC', 'ADBE', 'NKE', 'UPS', 'RTX', 'BMY', 'T', 'LOW', 'INTC', 'MS', 
-            'QCOM', 'HON', 'IBM', 'UNP', 'INTU', 'SBUX', 'GE', 'EL', 'DE', 'GS', 
-            'AMAT', 'C', 'CAT', 'PLD', 'BLK', 'BA', 'SCHW', 'CVS', 'AMT', 'MMC', 
-            'COP', 'LMT', 'ADP', 'AXP', 'MDT', 'CI', 'GILD', 'ISRG', 'TJX', 'VRTX', 
-            'TGT', 'MO', 'ZTS', 'EOG', 'BDX', 'SO', 'FI', 'SPGI', 'REGN', 'NOW', 
-            'SYK', 'CB', 'BKNG', 'DUK', 'LRCX', 'ADI', 'Z', 'UBER', 'ABNB', 'PANW'
-        ]
+        candidates = _CANDIDATES
         results = []
         
-        for sym in candidates:
-            r = self.calculate_ratios(sym)
-            score = 0
-            if 0 < r.pe_ratio < 25: score += 1
-            if 0 < r.pb_ratio < 5: score += 1
-            if r.roe > 15: score += 1
-            if r.debt_to_equity < 1.0: score += 1
-            
-            if score >= 3:
-                results.append({
-                    "symbol": sym,
-                    "score": score,
-                    "pe_ratio": r.pe_ratio,
-                    "roe": r.roe
-                })
+        # One batched price download weeds out delisted/invalid tickers before
+        # paying for a per-ticker fundamentals call on each of them.
+        priced = self.data_manager.get_stock_data_batch(candidates, period="5d")
+        if priced:
+            candidates = [sym for sym in candidates if sym in priced]
+        
+        # Ratios come back in candidate order so ties keep a stable ranking
+        rs = self._ratios_for(candidates)
+        pe = np.array([r.pe_ratio for r in rs], dtype=np.float64)
+        pb = np.array([r.pb_ratio for r in rs], dtype=np.float64)
+        roe = np.array([r.roe for r in rs], dtype=np.float64)
+        de = np.array([r.debt_to_equity for r in rs], dtype=np.float64)
+        
+        score = (((pe > 0) & (pe < 25)).astype(int) + ((pb > 0) & (pb < 5)).astype(int)
+                 + (roe > 15).astype(int) + (de < 1.0).astype(int))
         
-        # Sort by score desc
-        results.sort(key=lambda x: x['score'], reverse=True)
-        return results[:limit]
+        # Keep score >= 3, sorted by score desc (stable, so candidate order breaks ties)
+        passing = np.flatnonzero(score >= 3)
+        top = passing[np.argsort(-score[passing], kind='stable')][:limit]
+        
+        for i in top:
+            results.append({
+                "symbol": candidates[i],
+                "score": int(score[i]),
+                "pe_ratio": rs[i].pe_ratio,
+                "roe": rs[i].roe
+            })
+        return results
@@ -1,15 +1,15 @@
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from data_layer import BISTDataManager
-from analysis_layer import FinancialAnalyzer
-from transformers import pipeline
-import yfinance as yf
+from analysis_layer import FinancialAnalyzer, cached_ratios, FUNDAMENTALS_TTL
+from models import get_models, warm_up, compute_all, predict_proba, score_headlines, SENTIMENT_MODEL
+import torch
 import pandas as pd
-import joblib
 import numpy as np
 import os
 import json
 import traceback
+from diskcache import Cache
 
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -27,52 +27,50 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Uvicorn worker processes. Handlers are plain `def`, so FastAPI already runs them in
+# its threadpool and blocking yfinance I/O overlaps across requests; model inference
+# is CPU-bound under the GIL, so extra processes are what parallelize it.
+WORKERS = max(1, int(os.getenv("UVICORN_WORKERS", "2")))
+
+# Split the cores between workers instead of every worker spawning one thread per
+# core (N workers x N threads thrash caches). Applied before any model is built.
+INFERENCE_THREADS = max(1, (os.cpu_count() or 2) // WORKERS)
+
 # Initialize Core
 dm = BISTDataManager()
 analyzer = FinancialAnalyzer(dm)
 
-# Initialize Sentiment Analysis Model (Hugging Face)
-print("Loading Sentiment Model...")
-try:
-    sentiment_pipe = pipeline("sentiment-analysis", model="ProsusAI/finbert")
-    print("Sentiment Model Loaded!")
-except Exception as e:
-    print(f"Error loading sentiment model: {e}")
-    sentiment_pipe = None
-
-# Initialize Custom AdaBoost Model
-print("Loading Custom AdaBoost Model...")
-try:
-    custom_model = joblib.load('adaboost_model.joblib')
-    scaler = joblib.load('scaler.joblib')
-    print("AdaBoost Model Loaded!")
-except Exception as e:
-    print(f"Warning: Could not load custom model: {e}")
-    custom_model = None
-    scaler = None
-
-def calculate_features(df):
-    df = df.copy()
+# Fundamentals (P/E, P/B, ROE) barely move intra-day. A disk cache is shared by all
+# Uvicorn workers and survives restarts, so a cold worker skips the yfinance round trips.
+fundamentals_cache = Cache(os.getenv("STOCK_CACHE_DIR", "/tmp/stock_cache"))
+
+# Models (sentiment scorer + custom model, same loader as the Streamlit app) are loaded
+# per worker in the startup hook, not at import: `python api.py` imports this module in
+# the Uvicorn supervisor too, which never serves requests.
+models = {}
+sentiment_pipe = None
+custom_model = None
+
+@app.on_event("startup")
+def load_models():
+    global sentiment_pipe, custom_model
+    torch.set_num_threads(INFERENCE_THREADS)
     try:
-        df['Returns'] = df['Close'].pct_change()
-        df['SMA_20'] = df['Close'].rolling(window=20).mean()
-        df['SMA_50'] = df['Close'].rolling(window=50).mean()
-        df['Dist_SMA_20'] = (df['Close'] - df['SMA_20']) / df['SMA_20']
-        df['Dist_SMA_50'] = (df['Close'] - df['SMA_50']) / df['SMA_50']
-        
-        # RSI
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
-        
-        df['Vol_Change'] = df['Volume'].pct_change()
-        
-        return df[['Returns', 'Dist_SMA_20', 'Dist_SMA_50', 'RSI', 'Vol_Change']].iloc[[-1]]
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Only settable once per process; a repeated startup (e.g. a second
+        # TestClient) keeps the value from the first one
+        pass
+    models.update(get_models())
+    sentiment_pipe = models['sentiment']
+    custom_model = models['adaboost']
+
+    # Uvicorn only starts accepting connections once startup handlers finish,
+    # so no request lands on a cold worker
+    try:
+        warm_up(models)
     except Exception as e:
-        print(f"Feature calc error: {e}")
-        return pd.DataFrame()
+        print(f"Warm-up failed: {e}")
 
 @app.get("/")
 def read_root():
@@ -84,7 +82,16 @@ def health_check():
     if os.path.exists("model_metadata.json"):
         with open("model_metadata.json", "r") as f:
             metadata = json.load(f)
-    return {"status": "healthy", "model_metadata": metadata}
+    return {
+        "status": "healthy",
+        "model_metadata": metadata,
+        "sentiment_model": {
+            "id": SENTIMENT_MODEL,
+            "runtime": models['sentiment_runtime'],
+            "note": "Distilled models trade a little accuracy for roughly half the "
+                    "inference cost of FinBERT-base; set SENTIMENT_MODEL to switch."
+        }
+    }
 
 @app.get("/predict/{symbol}")
 def predict(symbol: str):
@@ -95,8 +102,8 @@ def predict(symbol: str):
     if df.empty:
         raise HTTPException(status_code=404, detail="Stock data not found")
         
-    last_close = float(df['Close'].iloc[-1])
-    sma20 = float(df['Close'].rolling(20).mean().iloc[-1]) if len(df) > 20 else last_close
+    # Features, SMA20 and last close from a single pass over the history
+    features, sma20, last_close = compute_all(df, models['rsi'])
     
     prediction = "UP" if last_close > sma20 else "DOWN"
     
@@ -104,17 +111,15 @@ def predict(symbol: str):
     custom_pred = "Insufficient Data"
     custom_conf = 0.0
     
-    if custom_model and scaler:
+    if custom_model:
         try:
             # We need enough data for rolling windows (50 days)
             # Fetch slightly more history ensuring we get it
             # We already fetched 1y above, so reuse 'df'
             if not df.empty and len(df) > 60:
-                features = calculate_features(df)
-                if not features.empty:
-                    features = features.fillna(0)
-                    features_scaled = scaler.transform(features)
-                    prob = custom_model.predict_proba(features_scaled)[0]
+                if features is not None:
+                    np.nan_to_num(features, copy=False)
+                    prob = predict_proba(models, features)
                     # Class 1 is UP
                     custom_pred = "UP" if prob[1] > 0.5 else "DOWN"
                     custom_conf = float(prob[1]) if custom_pred == "UP" else float(prob[0])
@@ -132,7 +137,7 @@ def predict(symbol: str):
         "custom_model": {
             "prediction": custom_pred,
             "confidence": custom_conf,
-            "model_type": "AdaBoost"
+            "model_type": type(custom_model).__name__ if custom_model else None
         }
     }
 
@@ -141,7 +146,7 @@ def analyze(symbol: str):
     """
     Returns financial ratios.
     """
-    r = analyzer.calculate_ratios(symbol)
+    r = cached_ratios(analyzer, fundamentals_cache, symbol)
     return {
         "symbol": symbol,
         "ratios": {
@@ -157,25 +162,29 @@ def get_undervalued(limit: int = 5):
     """
     Returns a list of undervalued stocks.
     """
-    stocks = analyzer.find_undervalued_stocks(limit=limit)
+    key = ('undervalued', limit)
+    stocks = fundamentals_cache.get(key)
+    if stocks is None:
+        stocks = analyzer.find_undervalued_stocks(limit=limit)
+        if stocks:
+            fundamentals_cache.set(key, stocks, expire=FUNDAMENTALS_TTL)
     return {"undervalued_stocks": stocks}
 
 @app.get("/sentiment/{symbol}")
 def get_sentiment(symbol: str):
     """
-    Fetches news and performs sentiment analysis using Hugging Face FinBERT.
+    Fetches news and performs sentiment analysis using the configured Hugging Face model.
     """
     try:
         if sentiment_pipe is None:
              return {"symbol": symbol, "error": "Sentiment model not loaded."}
 
         # 1. Fetch News
-        ticker = yf.Ticker(symbol)
-        news_items = ticker.news
+        news_items = dm.get_news(symbol)
         
         if not news_items:
              print(f"No news found for {symbol}. Trying generic market news (SPY)...")
-             news_items = yf.Ticker("SPY").news
+             news_items = dm.get_news("SPY")
              if not news_items: 
                 return {"symbol": symbol, "overall_sentiment": "Neutral", "news": []}
              
@@ -196,7 +205,7 @@ def get_sentiment(symbol: str):
             return {"symbol": symbol, "overall_sentiment": "Neutral", "news": []}
 
         # 3. Analyze Sentiment
-        results = sentiment_pipe(headlines)
+        results = score_headlines(sentiment_pipe, headlines)
         
         # 4. Aggregate Results
         sentiment_score = 0
@@ -225,4 +234,5 @@ def get_sentiment(symbol: str):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Multiple workers need the app as an import string
+    uvicorn.run("api:app", host="0.0.0.0", port=8000, workers=WORKERS)
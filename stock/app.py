@@ -1,80 +1,40 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import yfinance as yf
-import joblib
 import os
-from transformers import pipeline
+from concurrent.futures import ThreadPoolExecutor
 import plotly.graph_objects as go
+from diskcache import Cache
 from data_layer import BISTDataManager
-from analysis_layer import FinancialAnalyzer
+from analysis_layer import FinancialAnalyzer, cached_ratios
+from models import get_models, compute_all, predict_proba, score_headlines, SENTIMENT_MODEL
 
 # --- Configuration ---
 st.set_page_config(page_title="Stock Analysis AI (Hugging Face Edition)", layout="wide")
 
-# --- Model Loading (Cached) ---
+# --- Model Loading (once per process, same loader as the API) ---
+models = get_models()
+
+# Reruns would otherwise rebuild these and drop the data manager's cache
 @st.cache_resource
-def load_models():
-    print("Loading models...")
-    models = {}
-    
-    # 1. Sentiment Model
-    try:
-        models['sentiment'] = pipeline("sentiment-analysis", model="ProsusAI/finbert")
-    except Exception as e:
-        print(f"Sentiment Load Error: {e}")
-        models['sentiment'] = None
-        
-    # 2. Custom AdaBoost
-    try:
-        models['adaboost'] = joblib.load('adaboost_model.joblib')
-        models['scaler'] = joblib.load('scaler.joblib')
-    except Exception as e:
-        print(f"AdaBoost Load Error: {e}")
-        models['adaboost'] = None
-        models['scaler'] = None
-        
-    return models
+def _core():
+    dm = BISTDataManager()
+    return dm, FinancialAnalyzer(dm)
 
-models = load_models()
-dm = BISTDataManager()
-analyzer = FinancialAnalyzer(dm)
+dm, analyzer = _core()
 
 # --- Helper Functions ---
-def calculate_features(df):
-    df = df.copy()
-    try:
-        df['Returns'] = df['Close'].pct_change()
-        df['SMA_20'] = df['Close'].rolling(window=20).mean()
-        df['SMA_50'] = df['Close'].rolling(window=50).mean()
-        df['Dist_SMA_20'] = (df['Close'] - df['SMA_20']) / df['SMA_20']
-        df['Dist_SMA_50'] = (df['Close'] - df['SMA_50']) / df['SMA_50']
-        
-        # RSI
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
-        
-        df['Vol_Change'] = df['Volume'].pct_change()
-        
-        return df[['Returns', 'Dist_SMA_20', 'Dist_SMA_50', 'RSI', 'Vol_Change']].iloc[[-1]]
-    except Exception as e:
-        return pd.DataFrame()
-
 def analyze_sentiment(symbol):
     pipe = models['sentiment']
     if not pipe:
         return None
         
     try:
-        ticker = yf.Ticker(symbol)
-        news_items = ticker.news
+        news_items = dm.get_news(symbol)
         
         # Fallback to SPY
         if not news_items:
-            news_items = yf.Ticker("SPY").news
+            news_items = dm.get_news("SPY")
             
         headlines = []
         if news_items:
@@ -86,7 +46,7 @@ def analyze_sentiment(symbol):
         if not headlines:
             return None
             
-        results = pipe(headlines)
+        results = score_headlines(pipe, headlines)
         
         sentiment_score = 0
         analyzed_news = []
@@ -105,42 +65,65 @@ def analyze_sentiment(symbol):
     except Exception as e:
         return None
 
+# --- Cached Data Access ---
+# Reruns (every button click) reuse these instead of re-downloading from yfinance.
+@st.cache_data(ttl=900, show_spinner=False)
+def _fetch_prices(symbol, period):
+    return dm.get_stock_data(symbol, period)
+
+# (features, sma20, last_close) from a single pass over the history
+@st.cache_data(ttl=900, show_spinner=False)
+def _features(symbol, period):
+    return compute_all(_fetch_prices(symbol, period), models['rsi'])
+
+# Fundamentals change slowly; keep them on disk so Space restarts start warm
+@st.cache_resource
+def _fundamentals_cache():
+    return Cache(os.getenv("STOCK_CACHE_DIR", "/tmp/stock_cache"))
+
+# Resolved on the script thread: the ratios lookup runs in a worker thread, which has
+# no Streamlit script context for st.cache_* lookups
+fundamentals_cache = _fundamentals_cache()
+
 # --- UI Layout ---
 st.title("📈 Stock Analysis AI (Hugging Face Demo)")
-st.caption("Powered by Custom AdaBoost, ProsusAI FinBERT, and Python")
+st.caption(f"Powered by a custom gradient-boosting model, {SENTIMENT_MODEL}, and Python")
 
 symbol = st.text_input("Enter Stock Symbol:", value="AAPL").upper()
 
 if st.button("Analyze Stock"):
     with st.spinner(f"Analyzing {symbol}..."):
         # 1. Fetch Data
-        df = dm.get_stock_data(symbol, period="1y")
+        df = _fetch_prices(symbol, "1y")
         
         if df.empty:
             st.error("Stock data not found.")
         else:
-            # 2. Basic Metrics
-            last_close = float(df['Close'].iloc[-1])
-            sma20 = float(df['Close'].rolling(20).mean().iloc[-1])
-            basic_pred = "UP" if last_close > sma20 else "DOWN"
-            
-            # 3. Custom Model
-            custom_pred = "Insufficient Data"
-            custom_conf = 0.0
-            if models['adaboost'] and models['scaler'] and len(df) > 60:
-                feats = calculate_features(df)
-                if not feats.empty:
-                     feats = feats.fillna(0)
-                     feats_scaled = models['scaler'].transform(feats)
-                     prob = models['adaboost'].predict_proba(feats_scaled)[0]
-                     custom_pred = "UP" if prob[1] > 0.5 else "DOWN"
-                     custom_conf = float(prob[1]) if custom_pred == "UP" else float(prob[0])
-            
-            # 4. Sentiment
-            sent_data = analyze_sentiment(symbol)
-            
-            # 5. Financials
-            ratios = analyzer.calculate_ratios(symbol)
+            # Sentiment (news fetch + model) and fundamentals don't depend on the price
+            # data, so they run alongside the metrics/model instead of after them.
+            # Neither touches Streamlit APIs; `models` is only read.
+            with ThreadPoolExecutor(max_workers=2) as ex:
+                # 4. Sentiment
+                f_sent = ex.submit(analyze_sentiment, symbol)
+                # 5. Financials
+                f_ratios = ex.submit(cached_ratios, analyzer, fundamentals_cache, symbol)
+                
+                # 2. Basic Metrics
+                feats, sma20, last_close = _features(symbol, "1y")
+                basic_pred = "UP" if last_close > sma20 else "DOWN"
+                
+                # 3. Custom Model
+                custom_pred = "Insufficient Data"
+                custom_conf = 0.0
+                if models['adaboost'] and len(df) > 60:
+                    if feats is not None:
+                         np.nan_to_num(feats, copy=False)
+                         prob = predict_proba(models, feats)
+                         custom_pred = "UP" if prob[1] > 0.5 else "DOWN"
+                         custom_conf = float(prob[1]) if custom_pred == "UP" else float(prob[0])
+                
+                sent_data = f_sent.result()
+                ratios = f_ratios.result()
             
             # --- Display ---
             st.success("Analysis Complete!")
@@ -152,7 +135,8 @@ if st.button("Analyze Stock"):
             
             # Custom Model
             delta_color = "normal" if custom_pred == "UP" else "inverse"
-            c3.metric("🎓 Custom AdaBoost", custom_pred, delta=f"Conf: {custom_conf*100:.1f}%", delta_color=delta_color)
+            model_name = type(models['adaboost']).__name__ if models['adaboost'] else "Model"
+            c3.metric(f"🎓 Custom {model_name}", custom_pred, delta=f"Conf: {custom_conf*100:.1f}%", delta_color=delta_color)
             
             st.divider()
             
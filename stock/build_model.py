@@ -1,27 +1,69 @@
 import yfinance as yf
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import AdaBoostClassifier
-from sklearn.tree import DecisionTreeClassifier
+from sklearn.ensemble import HistGradientBoostingClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report
-from sklearn.preprocessing import StandardScaler
 import joblib
 import json
 import datetime
 import os
+import glob
+import hashlib
+from _kernels import rolling_mean
 
 def calculate_rsi(data, window=14):
-    delta = data.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
+    # Wilder's RSI: smoothed averages are an EWMA with alpha = 1/window
+    delta = np.diff(data.to_numpy(dtype=np.float64), prepend=np.nan)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    gain[0] = loss[0] = np.nan  # no change on the first bar
+    avg_gain = pd.Series(gain, index=data.index).ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+    avg_loss = pd.Series(loss, index=data.index).ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+    rs = avg_gain / avg_loss
     return 100 - (100 / (1 + rs))
 
-def prepare_data(ticker="SPY", period="2y"):
+FEATURES = ['Returns', 'Dist_SMA_20', 'Dist_SMA_50', 'RSI', 'Vol_Change']
+# RSI formulation used by calculate_rsi; recorded in model_metadata.json for serving
+RSI_VARIANT = "wilder"
+# Bump whenever _fetch_features changes, so cached frames from older code aren't reused
+FEATURE_VERSION = 2
+CACHE_DIR = ".cache"
+
+def _feature_tag():
+    # Identifies the feature code in cache file names (version, RSI variant, feature list)
+    digest = hashlib.blake2b(",".join(FEATURES).encode(), digest_size=4).hexdigest()
+    return f"v{FEATURE_VERSION}-{RSI_VARIANT}-{digest}"
+
+def prepare_data(ticker="SPY", period="2y", use_cache=True):
     """
     Fetches data and engineers features for training.
+    The engineered frame is cached as parquet per (ticker, period, feature code, day),
+    so repeated builds on the same day skip the yfinance download. Only the latest
+    file per (ticker, period) is kept.
     """
+    cache_path = os.path.join(
+        CACHE_DIR, f"{ticker}_{period}_{_feature_tag()}_{datetime.date.today().isoformat()}.parquet"
+    )
+    if use_cache and os.path.exists(cache_path):
+        print(f"Loading cached data for {ticker} from {cache_path}...")
+        df = pd.read_parquet(cache_path)
+    else:
+        df = _fetch_features(ticker, period)
+        if use_cache:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            # Earlier days / feature versions are never read again
+            for stale in glob.glob(os.path.join(CACHE_DIR, glob.escape(f"{ticker}_{period}_") + "*.parquet")):
+                os.remove(stale)
+            df.to_parquet(cache_path)
+    
+    # float32 halves the feature matrix; the tree models split on float32 natively
+    X = df[FEATURES].astype(np.float32)
+    y = df['Target']
+    
+    return X, y
+
+def _fetch_features(ticker, period):
     print(f"Fetching data for {ticker}...")
     df = yf.ticker.Ticker(ticker).history(period=period)
     
@@ -29,15 +71,16 @@ def prepare_data(ticker="SPY", period="2y"):
         raise ValueError("No data fetched.")
         
     # Feature Engineering
-    df['Returns'] = df['Close'].pct_change()
-    df['SMA_20'] = df['Close'].rolling(window=20).mean()
-    df['SMA_50'] = df['Close'].rolling(window=50).mean()
+    df['Returns'] = df['Close'].pct_change(fill_method=None)
+    close = df['Close'].to_numpy(dtype=np.float64)
+    df['SMA_20'] = rolling_mean(close, 20)
+    df['SMA_50'] = rolling_mean(close, 50)
     
     # Relative features (normalized) to make model ticker-agnostic
     df['Dist_SMA_20'] = (df['Close'] - df['SMA_20']) / df['SMA_20']
     df['Dist_SMA_50'] = (df['Close'] - df['SMA_50']) / df['SMA_50']
     df['RSI'] = calculate_rsi(df['Close'])
-    df['Vol_Change'] = df['Volume'].pct_change()
+    df['Vol_Change'] = df['Volume'].pct_change(fill_method=None)
     
     # Target: 1 if Next Day Close > Current Close, else 0
     df['Target'] = (df['Close'].shift(-1) > df['Close']).astype(int)
@@ -45,14 +88,10 @@ def prepare_data(ticker="SPY", period="2y"):
     # Drop NaNs created by rolling windows
     df = df.dropna()
     
-    features = ['Returns', 'Dist_SMA_20', 'Dist_SMA_50', 'RSI', 'Vol_Change']
-    X = df[features]
-    y = df['Target']
-    
-    return X, y
+    return df[FEATURES + ['Target']]
 
 def build_model():
-    print("Starting Custom Model Training (AdaBoost)...")
+    print("Starting Custom Model Training (HistGradientBoosting)...")
     
     try:
         # 1. Get Training Data (Use SPY as a general proxy for market behavior)
@@ -61,38 +100,52 @@ def build_model():
         # 2. Split
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, shuffle=False)
         
-        # 3. Scale Features
-        scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
-        X_test_scaled = scaler.transform(X_test)
-        
-        # 4. Train AdaBoost
-        # Base estimator: Random Forest (User mentioned "AdaBoost... powerful combination")
-        # Standard AdaBoost uses Decision Stumps (depth=1), but we can use slightly deeper trees.
-        dt = DecisionTreeClassifier(max_depth=1, random_state=42)
-        model = AdaBoostClassifier(estimator=dt, n_estimators=100, random_state=42)
+        # 3. Train Gradient Boosting
+        # Histogram-based trees bin each feature, so they are invariant to monotonic
+        # scaling and no StandardScaler is needed in front of the model.
+        model = HistGradientBoostingClassifier(
+            max_iter=200, max_depth=4, learning_rate=0.05, early_stopping=True, random_state=42
+        )
         
         print("Training model...")
-        model.fit(X_train_scaled, y_train)
+        model.fit(X_train, y_train)
         
-        # 5. Evaluate
-        preds = model.predict(X_test_scaled)
+        # 4. Evaluate
+        preds = model.predict(X_test)
         acc = accuracy_score(y_test, preds)
         print("------------------------------------------------")
         print(f"Model Accuracy on Test Set: {acc:.4f}")
         print("------------------------------------------------")
         
-        # 6. Save Artifacts
+        # 5. Save Artifacts
+        # File name kept for compatibility with the deploy scripts and Dockerfiles
         print("Saving model artifacts...")
-        joblib.dump(model, 'adaboost_model.joblib')
-        joblib.dump(scaler, 'scaler.joblib')
+        # Uncompressed so the API can memory-map the tree node arrays (shared by workers)
+        joblib.dump(model, 'adaboost_model.joblib', compress=0)
+        # A scaler left over from an older build would be applied by the API; remove it
+        if os.path.exists('scaler.joblib'):
+            os.remove('scaler.joblib')
+        
+        # Same model as a single ONNX graph for onnxruntime serving (joblib stays the fallback)
+        try:
+            # Imported here so a skl2onnx/scikit-learn mismatch only skips the export
+            from skl2onnx import to_onnx
+            onx = to_onnx(model, X_train.to_numpy()[:1], options={id(model): {'zipmap': False}})
+            with open('model.onnx', 'wb') as f:
+                f.write(onx.SerializeToString())
+        except Exception as e:
+            print(f"Warning: ONNX export failed, serving will use the joblib model: {e}")
+            if os.path.exists('model.onnx'):
+                os.remove('model.onnx')
         
         # Metadata
         metadata = {
-            "model_type": "AdaBoostClassifier",
+            "model_type": "HistGradientBoostingClassifier",
             "trained_at": datetime.datetime.now().isoformat(),
             "accuracy": acc,
-            "features": ['Returns', 'Dist_SMA_20', 'Dist_SMA_50', 'RSI', 'Vol_Change']
+            "features": FEATURES,
+            # Serving picks its RSI from this; older metadata without it means rolling-mean RSI
+            "rsi": RSI_VARIANT
         }
         
         with open("model_metadata.json", "w") as f:
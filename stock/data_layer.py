@@ -1,6 +1,8 @@
 import yfinance as yf
 import pandas as pd
 import numpy as np
+import threading
+import time
 from datetime import datetime, timedelta
 
 class BISTDataManager:
@@ -8,13 +10,51 @@ class BISTDataManager:
     Data Manager for Stock Analysis.
     Originally designed for BIST, now adapted for general usage (S&P 500 support) via yfinance.
     """
-    def __init__(self):
+    def __init__(self, cache_ttl: float = 3600, cache_size: int = 512, news_ttl: float = 300):
+        # {key: (stored_at, value)}; shared by API/Streamlit worker threads
         self.cache = {}
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        # Headlines go stale much faster than prices/fundamentals
+        self.news_ttl = news_ttl
+        self._cache_lock = threading.Lock()
+        # Striped locks so concurrent misses for the same key share one fetch. A fixed
+        # set keeps memory bounded although keys come from user-supplied symbols;
+        # unrelated keys sharing a stripe just fetch one after the other.
+        self._fetch_locks = [threading.Lock() for _ in range(64)]
+
+    def _cache_get(self, key, ttl: float = None):
+        ttl = self.cache_ttl if ttl is None else ttl
+        with self._cache_lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > ttl:
+                del self.cache[key]
+                return None
+            return value
+
+    def _fetch_lock(self, key):
+        return self._fetch_locks[hash(key) % len(self._fetch_locks)]
+
+    def _cache_set(self, key, value):
+        with self._cache_lock:
+            if key not in self.cache and len(self.cache) >= self.cache_size:
+                # Evict the oldest entry (dicts keep insertion order)
+                del self.cache[next(iter(self.cache))]
+            self.cache[key] = (time.monotonic(), value)
 
     def get_stock_data(self, symbol: str, period: str = "1y") -> pd.DataFrame:
         """
         Fetches historical stock data for the given symbol and period.
+        Results are cached for `cache_ttl` seconds. The returned frame is the cached
+        object itself (no per-call copy), so treat it as read-only.
         """
+        cached = self._cache_get(('history', symbol, period))
+        if cached is not None:
+            return cached
+
         try:
             # yfinance periodic strings: 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max
             ticker = yf.Ticker(symbol)
@@ -29,25 +69,124 @@ class BISTDataManager:
             if not all(col in history.columns for col in required_cols):
                  return pd.DataFrame()
 
+            self._cache_set(('history', symbol, period), history)
             return history
 
         except Exception as e:
             print(f"Error fetching data for {symbol}: {e}")
             return pd.DataFrame()
 
+    def get_stock_data_batch(self, symbols: list, period: str = "1y") -> dict:
+        """
+        Fetches historical data for many symbols in one batched yfinance download.
+        Returns a dict of {symbol: DataFrame}; symbols without data are omitted.
+        Shares the get_stock_data cache: cached symbols are not downloaded again,
+        and freshly downloaded ones are cached per symbol. Returns {} if the
+        download fails or comes back empty, even when some symbols were cached.
+        """
+        results = {}
+        missing = []
+        for sym in symbols:
+            cached = self._cache_get(('history', sym, period))
+            if cached is not None:
+                results[sym] = cached
+            else:
+                missing.append(sym)
+        if not missing:
+            return results
+
+        try:
+            data = yf.download(missing, period=period, group_by='ticker', threads=True, progress=False)
+        except Exception as e:
+            print(f"Error fetching batch data: {e}")
+            # Empty on failure, as callers treat a partial dict as "the rest have no data"
+            return {}
+
+        if data.empty:
+            # yfinance's usual failure mode; same as an exception, not "none of them exist"
+            return {}
+
+        required_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
+        for sym in missing:
+            if isinstance(data.columns, pd.MultiIndex):
+                if sym not in data.columns.get_level_values(0):
+                    continue
+                history = data[sym]
+            else:
+                # Older yfinance returns flat columns for a single ticker
+                history = data
+            history = history.dropna(how='all')
+            if history.empty or not all(col in history.columns for col in required_cols):
+                continue
+            self._cache_set(('history', sym, period), history)
+            results[sym] = history
+        return results
+
+    def get_news(self, symbol: str) -> list:
+        """
+        Fetches recent news items for the given symbol.
+        Results are cached for `news_ttl` seconds; concurrent misses share one request.
+        """
+        key = ('news', symbol)
+        cached = self._cache_get(key, ttl=self.news_ttl)
+        if cached is not None:
+            return cached
+
+        with self._fetch_lock(key):
+            # Another thread may have fetched it while we waited
+            cached = self._cache_get(key, ttl=self.news_ttl)
+            if cached is not None:
+                return cached
+            try:
+                news = list(yf.Ticker(symbol).news or [])
+            except Exception as e:
+                print(f"Error fetching news for {symbol}: {e}")
+                return []
+            self._cache_set(key, news)
+            return news
+
+    def get_info(self, symbol: str):
+        """
+        Fetches only the ticker info/fundamentals summary (a single HTTP call),
+        skipping the statement DataFrames that get_financials downloads.
+        Results are cached for `cache_ttl` seconds.
+        """
+        cached = self._cache_get(('info', symbol))
+        if cached is None:
+            # A recent get_financials call already holds the same payload
+            financials = self._cache_get(('financials', symbol))
+            cached = financials['info'] if financials else None
+        if cached is not None:
+            return cached
+
+        try:
+            info = dict(yf.Ticker(symbol).info or {})
+            self._cache_set(('info', symbol), info)
+            return info
+        except Exception as e:
+            print(f"Error fetching info for {symbol}: {e}")
+            return None
+
     def get_financials(self, symbol: str):
         """
         Fetches financial data (balance sheet, financials, etc.)
+        Results are cached for `cache_ttl` seconds.
         """
+        cached = self._cache_get(('financials', symbol))
+        if cached is not None:
+            return cached
+
         try:
             ticker = yf.Ticker(symbol)
-            # Fetching data can be slow, so we cache it lightly if needed, but for now direct call
-            return {
-                'info': ticker.info,
+            financials = {
+                # Plain dict so the payload does not hold on to the yfinance wrapper
+                'info': dict(ticker.info or {}),
                 'balance_sheet': ticker.balance_sheet,
                 'financials': ticker.financials,
                 'cashflow': ticker.cashflow
             }
+            self._cache_set(('financials', symbol), financials)
+            return financials
         except Exception as e:
             print(f"Error fetching financials for {symbol}: {e}")
             return None
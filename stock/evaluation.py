@@ -1,5 +1,6 @@
 import argparse
 from data_layer import BISTDataManager
+from _kernels import rolling_mean
 import pandas as pd
 import numpy as np
 
@@ -15,22 +16,27 @@ def evaluate_strategy(symbol: str):
         print("No data.")
         return
 
-    # Calculate indicators
-    df['SMA20'] = df['Close'].rolling(window=20).mean()
+    # Work on a plain float64 buffer instead of adding columns to df
+    close = df['Close'].to_numpy(dtype=np.float64)
+    sma20 = rolling_mean(close, 20)
     
-    # Strategy: 1 if Price > SMA20 else 0
-    df['Signal'] = np.where(df['Close'] > df['SMA20'], 1, 0)
-    df['Position'] = df['Signal'].shift() # Enter next day
+    # Strategy: 1 if Price > SMA20 else 0 (NaN SMA compares False)
+    signal = (close > sma20).astype(np.int8)
+    position = np.empty_like(signal)  # Enter next day
+    position[0] = 0
+    position[1:] = signal[:-1]
     
-    df['Daily_Return'] = df['Close'].pct_change()
-    df['Strategy_Return'] = df['Position'] * df['Daily_Return']
+    daily_return = np.empty_like(close)
+    daily_return[0] = 0.0
+    daily_return[1:] = close[1:] / close[:-1] - 1
+    strategy_return = position * daily_return
     
     # Cumulative Return
-    df['Cum_Market'] = (1 + df['Daily_Return']).cumprod()
-    df['Cum_Strategy'] = (1 + df['Strategy_Return']).cumprod()
+    cum_market = np.cumprod(1 + daily_return)
+    cum_strategy = np.cumprod(1 + strategy_return)
     
-    total_market_return = (df['Cum_Market'].iloc[-1] - 1) * 100
-    total_strategy_return = (df['Cum_Strategy'].iloc[-1] - 1) * 100
+    total_market_return = (cum_market[-1] - 1) * 100
+    total_strategy_return = (cum_strategy[-1] - 1) * 100
     
     print(f"--- Performance Evaluation: {symbol} ---")
     print(f"Period: {df.index[0].date()} to {df.index[-1].date()}")
@@ -39,11 +45,11 @@ def evaluate_strategy(symbol: str):
     
     # Validation vs Training (Split 80/20)
     split_idx = int(len(df) * 0.8)
-    train_df = df.iloc[:split_idx]
-    val_df = df.iloc[split_idx:]
     
-    train_ret = (1 + train_df['Strategy_Return']).cumprod().iloc[-1] - 1
-    val_ret = (1 + val_df['Strategy_Return']).cumprod().iloc[-1] - 1
+    # Both periods fall out of the full cumulative product computed above
+    train_growth = cum_strategy[split_idx - 1] if split_idx > 0 else 1.0
+    train_ret = train_growth - 1
+    val_ret = cum_strategy[-1] / train_growth - 1
     
     print(f"Training Return: {train_ret*100:.2f}%")
     print(f"Validation Return: {val_ret*100:.2f}%")
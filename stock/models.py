@@ -0,0 +1,231 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import joblib
+import numpy as np
+import onnxruntime as ort
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+from _kernels import rsi_last, rsi_sma_last
+
+# Distilled financial-news model by default (~half of FinBERT-base's layers);
+# set SENTIMENT_MODEL=ProsusAI/finbert for the full-size model.
+SENTIMENT_MODEL = os.getenv("SENTIMENT_MODEL", "mrm8488/distilroberta-finetuned-financial-news-sentiment-analysis")
+# The Docker image exports SENTIMENT_MODEL to ONNX and quantizes it to INT8 at build
+# time, recording the source model id next to it. The export is only used when that id
+# matches SENTIMENT_MODEL; otherwise (or outside the image) the PyTorch model is used.
+SENTIMENT_ONNX_DIR = os.getenv("SENTIMENT_ONNX_DIR", "sentiment_onnx_int8")
+
+def _model_rsi():
+    """
+    RSI variant the custom model was trained on ('wilder' or 'sma'), from model_metadata.json.
+    Builds from before the Wilder switch don't record it and used the rolling-mean RSI.
+    """
+    try:
+        with open('model_metadata.json') as f:
+            return json.load(f).get('rsi', 'sma')
+    except (OSError, ValueError):
+        return 'sma'
+
+def _onnx_source_model():
+    """
+    Model id the ONNX export in SENTIMENT_ONNX_DIR was built from, or None if unknown.
+    """
+    try:
+        with open(os.path.join(SENTIMENT_ONNX_DIR, "source_model.txt")) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+class SentimentScorer:
+    """
+    Scores a batch of headlines with one tokenizer call and one forward pass.
+    Returns [{'label', 'score'}] per headline like the transformers sentiment
+    pipeline, without its per-item pre/post-processing.
+    """
+    def __init__(self, model, tokenizer, max_length: int = 64):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        self.id2label = model.config.id2label
+
+    @torch.inference_mode()
+    def __call__(self, headlines):
+        enc = self.tokenizer(
+            list(headlines), padding=True, truncation=True,
+            max_length=self.max_length, return_tensors='pt'
+        ).to(self.model.device)
+        probs = self.model(**enc).logits.softmax(-1).cpu().numpy()
+        return [{'label': self.id2label[int(i)], 'score': float(probs[row, i])}
+                for row, i in enumerate(probs.argmax(1))]
+
+@lru_cache(maxsize=1)
+def get_models():
+    """
+    Loads the sentiment model and the custom model once per process.
+    Shared by the FastAPI service and the Streamlit app so both use one copy.
+    Thread settings (torch.set_num_threads) must be applied before the first call.
+    """
+    models = {}
+
+    # 1. Sentiment Model
+    print("Loading Sentiment Model...")
+    try:
+        # All headlines of a call share one padded forward pass (SentimentScorer).
+        # Headline sentiment is settled well within 64 tokens; capping the length bounds
+        # the quadratic attention cost of the occasional long title.
+        onnx_source = _onnx_source_model()
+        if onnx_source == SENTIMENT_MODEL:
+            # Only the Docker image ships the exported model, so optimum stays optional
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+            opts = ort.SessionOptions()
+            opts.intra_op_num_threads = torch.get_num_threads()
+            opts.inter_op_num_threads = 1
+            models['sentiment_runtime'] = "onnxruntime-int8"
+            model = ORTModelForSequenceClassification.from_pretrained(
+                SENTIMENT_ONNX_DIR, file_name="model_quantized.onnx", session_options=opts
+            )
+            # Tokenizer saved with the export, so it always matches the graph's vocabulary
+            tokenizer = AutoTokenizer.from_pretrained(SENTIMENT_ONNX_DIR)
+        else:
+            if os.path.isdir(SENTIMENT_ONNX_DIR):
+                print(f"Ignoring {SENTIMENT_ONNX_DIR}: exported from {onnx_source or 'an unknown model'}, "
+                      f"not {SENTIMENT_MODEL}. Using PyTorch.")
+            models['sentiment_runtime'] = "pytorch"
+            tokenizer = AutoTokenizer.from_pretrained(SENTIMENT_MODEL)
+            model = AutoModelForSequenceClassification.from_pretrained(SENTIMENT_MODEL).eval()
+            if torch.cuda.is_available():
+                model = model.to("cuda")
+        models['sentiment'] = SentimentScorer(model, tokenizer, max_length=64)
+        print("Sentiment Model Loaded!")
+    except Exception as e:
+        print(f"Error loading sentiment model: {e}")
+        models['sentiment'] = None
+        models['sentiment_runtime'] = None
+
+    # 2. Custom Model
+    print("Loading Custom Model...")
+    try:
+        # mmap_mode: the numpy arrays inside (tree nodes, scaler stats) stay file-backed,
+        # so Uvicorn workers share them through the page cache. Compressed artifacts from
+        # older builds can't be mapped; joblib then loads them into memory as before.
+        models['adaboost'] = joblib.load('adaboost_model.joblib', mmap_mode='r')
+        # Only models built before the HistGradientBoosting switch ship a scaler
+        models['scaler'] = joblib.load('scaler.joblib', mmap_mode='r') if os.path.exists('scaler.joblib') else None
+        print(f"{type(models['adaboost']).__name__} Model Loaded!")
+        # Serving features must use the same RSI as the artifact was trained on
+        models['rsi'] = _model_rsi()
+    except Exception as e:
+        print(f"Warning: Could not load custom model: {e}")
+        models['adaboost'] = None
+        models['scaler'] = None
+        models['rsi'] = 'wilder'
+
+    # 3. ONNX export of the same model (written by build_model.py): the whole tree
+    # ensemble runs in one onnxruntime call. One intra-op thread per process avoids
+    # oversubscribing the CPU under multiple workers.
+    models['onnx'] = None
+    if models['adaboost'] and os.path.exists('model.onnx'):
+        try:
+            opts = ort.SessionOptions()
+            opts.intra_op_num_threads = 1
+            models['onnx'] = ort.InferenceSession('model.onnx', opts, providers=['CPUExecutionProvider'])
+            print("ONNX Model Loaded!")
+        except Exception as e:
+            print(f"Warning: Could not load ONNX model, using joblib: {e}")
+
+    return models
+
+def warm_up(models):
+    """
+    Runs each model once on dummy input so one-time costs (kernel selection, allocator
+    growth, Numba JIT) are paid before the first real request.
+    """
+    # Straight to the kernel/scorer so dummy inputs stay out of the caches below
+    (rsi_last if models['rsi'] == 'wilder' else rsi_sma_last)(np.zeros(16), 14)
+    if models['sentiment'] is not None:
+        models['sentiment'](["warmup headline"] * 16)
+    if models['adaboost'] is not None:
+        predict_proba(models, np.zeros((1, 5), dtype=np.float32))
+
+def predict_proba(models, features):
+    """
+    Class probabilities [DOWN, UP] of the custom model for a (1, 5) feature array.
+    """
+    if models['onnx'] is not None:
+        return models['onnx'].run(None, {'X': features.astype(np.float32, copy=False)})[1][0]
+    scaler = models['scaler']
+    # StandardScaler.transform as two broadcasts, without sklearn's input validation
+    features_scaled = (features - scaler.mean_) / scaler.scale_ if scaler else features
+    model = models['adaboost']
+    if hasattr(model, 'decision_function'):
+        # Binary HistGradientBoosting (and legacy AdaBoost) probabilities are the
+        # sigmoid of the raw margin, so skip predict_proba's two-class normalization
+        margin = float(model.decision_function(features_scaled)[0])
+        p_up = 1.0 / (1.0 + np.exp(-margin))
+        return np.array([1.0 - p_up, p_up])
+    return model.predict_proba(features_scaled)[0]
+
+def compute_all(df, rsi='wilder'):
+    """
+    One pass over the price history for /predict-style callers.
+    Returns (features, sma20, last_close): the latest-bar model features as a (1, 5)
+    float32 array (the training dtype) in build_model's feature order (Returns, Dist_SMA_20, Dist_SMA_50, RSI,
+    Vol_Change), or None on failure, plus the SMA20 and close they are built from.
+    `rsi` is the variant the model was trained on (models['rsi']).
+    """
+    c = df['Close'].to_numpy(dtype=np.float64)
+    last_close = float(c[-1])
+    sma20 = float(c[-20:].mean()) if len(c) > 20 else last_close
+    try:
+        v = df['Volume'].to_numpy(dtype=np.float64)
+        sma50 = c[-50:].mean()
+        rsi = rsi_last(c, 14) if rsi == 'wilder' else rsi_sma_last(c, 14)
+        features = np.empty((1, 5), dtype=np.float32)
+        features[0] = (c[-1] / c[-2] - 1, c[-1] / sma20 - 1, c[-1] / sma50 - 1, rsi, v[-1] / v[-2] - 1)
+    except Exception as e:
+        print(f"Feature calc error: {e}")
+        features = None
+    return features, sma20, last_close
+
+# --- Sentiment cache ---
+# Sentiment results per headline, keyed by a 16-byte digest to bound memory.
+# Recurring headlines (e.g. the SPY fallback) skip tokenization and the forward pass.
+_SENTIMENT_CACHE = OrderedDict()
+_SENTIMENT_CACHE_SIZE = 4096
+_sentiment_cache_lock = threading.Lock()
+
+def _headline_key(headline):
+    return hashlib.blake2b(headline.encode(), digest_size=16).digest()
+
+def score_headlines(pipe, headlines):
+    """
+    Returns sentiment results for headlines, only running the model on ones not seen before.
+    """
+    keys = [_headline_key(h) for h in headlines]
+    found = {}
+    with _sentiment_cache_lock:
+        for k in keys:
+            if k in _SENTIMENT_CACHE:
+                _SENTIMENT_CACHE.move_to_end(k)
+                found[k] = _SENTIMENT_CACHE[k]
+
+    missing = list(dict.fromkeys(h for h, k in zip(headlines, keys) if k not in found))
+    if missing:
+        results = pipe(missing)
+        with _sentiment_cache_lock:
+            for h, r in zip(missing, results):
+                k = _headline_key(h)
+                # Models differ in label casing (e.g. 'Positive'); callers expect lowercase
+                r = {'label': r['label'].lower(), 'score': r['score']}
+                found[k] = _SENTIMENT_CACHE[k] = r
+                _SENTIMENT_CACHE.move_to_end(k)
+            while len(_SENTIMENT_CACHE) > _SENTIMENT_CACHE_SIZE:
+                _SENTIMENT_CACHE.popitem(last=False)
+
+    return [found[k] for k in keys]